@@ -0,0 +1,11 @@
+"""Compile the optional Cython WHERE kernel in place."""
+
+from Cython.Build import cythonize
+from setuptools import setup
+
+setup(
+    ext_modules=cythonize(["src/primitive_db/_cfilter.pyx"]),
+    package_dir={"": "."},
+    py_modules=[],
+    script_args=["build_ext", "--inplace"],
+)
@@ -0,0 +1,12 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""Cython kernel for WHERE-clause evaluation on object (str) columns."""
+
+from cpython.object cimport Py_EQ, PyObject_RichCompareBool
+
+
+def and_eq_object(object[:] col, object value, unsigned char[::1] mask):
+    """AND an equality test of an object column against value into mask."""
+    cdef Py_ssize_t i
+    for i in range(mask.shape[0]):
+        if mask[i] and not PyObject_RichCompareBool(col[i], value, Py_EQ):
+            mask[i] = 0
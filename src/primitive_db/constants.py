@@ -4,6 +4,17 @@ METADATA_FILE = "db_meta.json"
 DATA_DIR = "data"
 
 SUPPORTED_TYPES = ("int", "str", "bool")
+NUMPY_DTYPES = {"int": "int64", "str": "object", "bool": "bool"}
 
 ID_COLUMN = "ID"
 ID_TYPE = "int"
+
+INT_MIN = -(2**63)
+INT_MAX = 2**63 - 1
+
+DISPLAY_LIMIT = 100
+INDEX_MIN_LOOKUPS = 3
+JIT_MIN_ROWS = 100_000
+LOG_COMPACT_ROWS = 10000
+
+LOG_TIME_ENV = "PRIMITIVE_DB_LOG_TIME"
@@ -1,11 +1,21 @@
 """Core database logic for table management and data operations."""
 
-from src.primitive_db.constants import ID_COLUMN, ID_TYPE, SUPPORTED_TYPES
+import numpy as np
+
+from src.primitive_db.constants import (
+    ID_COLUMN,
+    ID_TYPE,
+    INT_MAX,
+    INT_MIN,
+    SUPPORTED_TYPES,
+)
 from src.primitive_db.decorators import (
     confirm_action,
     handle_db_errors,
     log_time,
 )
+from src.primitive_db.jit_kernels import and_eq_many
+from src.primitive_db.utils import cache_column_info
 
 
 @handle_db_errors
@@ -39,10 +49,10 @@ def create_table(metadata, table_name, columns):
 
     all_columns = [{"name": ID_COLUMN, "type": ID_TYPE}] + parsed_columns
 
-    metadata[table_name] = {
+    metadata[table_name] = cache_column_info({
         "columns": all_columns,
         "next_id": 1,
-    }
+    })
 
     columns_str = ", ".join(
         f"{col['name']}:{col['type']}" for col in all_columns
@@ -91,61 +101,107 @@ def table_info(metadata, table_name):
     print(f"Columns: {columns_str}")
 
 
-def validate_value(value, expected_type):
-    """Validate and convert a value to the expected type."""
-    if expected_type == "int":
-        if isinstance(value, int) and not isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            try:
-                return int(value)
-            except ValueError:
-                return None
+def _to_int(value):
+    if isinstance(value, bool):
         return None
+    if isinstance(value, str):
+        try:
+            value = int(value)
+        except ValueError:
+            return None
+    if isinstance(value, int) and INT_MIN <= value <= INT_MAX:
+        return value
+    return None
 
-    elif expected_type == "str":
-        if isinstance(value, str):
-            return value
-        return str(value)
-
-    elif expected_type == "bool":
-        if isinstance(value, bool):
-            return value
-        if isinstance(value, str):
-            if value.lower() == "true":
-                return True
-            if value.lower() == "false":
-                return False
-        return None
 
+def _to_str(value):
+    if isinstance(value, str):
+        return value
+    return str(value)
+
+
+def _to_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered == "true":
+            return True
+        if lowered == "false":
+            return False
     return None
 
 
-@handle_db_errors
-@log_time
-def insert(metadata, table_name, values, table_data):
-    """Insert a new record into a table."""
+def _reject(value):
+    return None
+
+
+_VALIDATORS = {"int": _to_int, "str": _to_str, "bool": _to_bool}
+
+
+def validate_value(value, expected_type):
+    """Validate and convert a value to the expected type."""
+    return _VALIDATORS.get(expected_type, _reject)(value)
+
+
+def row_count(table_data):
+    """Return the number of records stored in table columns."""
+    return len(table_data[ID_COLUMN])
+
+
+def _predicate_rank(col_name, col_type):
+    """Rank an equality predicate by expected selectivity, most selective first."""
+    if col_name == ID_COLUMN:
+        return 0
+    if col_type == "bool":
+        return 2
+    return 1
+
+
+def where_mask(table_data, table_meta, where_clause):
+    """Build a boolean row mask matching every WHERE condition."""
+    n_rows = row_count(table_data)
+    column_types = dict(zip(table_meta["_col_names"], table_meta["_col_types"]))
+
+    predicates = []
+    for col, value in where_clause:
+        if col not in table_data:
+            return np.zeros(n_rows, dtype=bool)
+
+        typed_value = validate_value(value, column_types[col])
+        if typed_value is None:
+            return np.zeros(n_rows, dtype=bool)
+
+        predicates.append((col, typed_value))
+
+    predicates.sort(key=lambda p: _predicate_rank(p[0], column_types[p[0]]))
+
+    mask = np.ones(n_rows, dtype=bool)
+    and_eq_many([(table_data[col], value) for col, value in predicates], mask)
+
+    return mask
+
+
+def _insert_core(metadata, table_name, values):
+    """Validate values into a new row tuple and advance the table's next ID."""
     if table_name not in metadata:
         print(f'Error: Table "{table_name}" does not exist.')
         return None, None, None
 
     table_meta = metadata[table_name]
-    columns = table_meta["columns"]
-    expected_count = len(columns) - 1
+    names = table_meta["_col_names"]
+    types = table_meta["_col_types"]
+    expected_count = len(names) - 1
 
     if len(values) != expected_count:
         print(f"Error: Expected {expected_count} values, got {len(values)}.")
         return None, None, None
 
     new_id = table_meta["next_id"]
-    record = {ID_COLUMN: new_id}
-
-    for i, value in enumerate(values):
-        col = columns[i + 1]
-        col_name = col["name"]
-        col_type = col["type"]
+    row = [new_id]
 
-        validated_value = validate_value(value, col_type)
+    for col_name, col_type, value in zip(names[1:], types[1:], values):
+        validated_value = _VALIDATORS[col_type](value)
         if validated_value is None:
             print(
                 f"Error: Invalid value '{value}' for column "
@@ -153,41 +209,131 @@ def insert(metadata, table_name, values, table_data):
             )
             return None, None, None
 
-        record[col_name] = validated_value
+        row.append(validated_value)
 
-    table_data.append(record)
     metadata[table_name]["next_id"] = new_id + 1
 
-    print(f'Record with ID={new_id} added to table "{table_name}" successfully.')
+    return metadata, tuple(row), new_id
 
-    return metadata, table_data, new_id
+
+@handle_db_errors
+@log_time
+def insert(metadata, table_name, values):
+    """Insert a new record into a table."""
+    new_meta, row, new_id = _insert_core(metadata, table_name, values)
+
+    if new_meta is not None:
+        print(
+            f'Record with ID={new_id} added to table "{table_name}" successfully.'
+        )
+
+    return new_meta, row, new_id
+
+
+def _column_array(values, col_name, col_type):
+    """Convert raw values of one column into a typed NumPy array."""
+    if col_type == "int":
+        try:
+            return np.asarray(values).astype(np.int64)
+        except (ValueError, OverflowError):
+            raise ValueError(
+                f"Invalid value for column '{col_name}' (expected int)."
+            ) from None
+
+    if col_type == "bool":
+        lowered = [value.lower() for value in values]
+        if not set(lowered) <= {"true", "false"}:
+            raise ValueError(
+                f"Invalid value for column '{col_name}' (expected bool)."
+            )
+        return np.array([value == "true" for value in lowered], dtype=bool)
+
+    return np.array(values, dtype=object)
 
 
 @handle_db_errors
 @log_time
-def select(table_data, columns, where_clause=None):
-    """Select records from a table."""
+def insert_many(metadata, table_name, rows, table_data):
+    """Insert a batch of records into a table in one vectorized pass."""
+    if table_name not in metadata:
+        print(f'Error: Table "{table_name}" does not exist.')
+        return None, None, None
+
+    table_meta = metadata[table_name]
+    names = table_meta["_col_names"]
+    types = table_meta["_col_types"]
+    expected_count = len(names) - 1
+
+    if not rows:
+        print("No records to insert.")
+        return None, None, None
+
+    for row_number, row in enumerate(rows, start=1):
+        if len(row) != expected_count:
+            print(
+                f"Error: Row {row_number}: expected {expected_count} values, "
+                f"got {len(row)}."
+            )
+            return None, None, None
+
+    new_id = table_meta["next_id"]
+    new_ids = np.arange(new_id, new_id + len(rows), dtype=np.int64)
+    new_columns = {ID_COLUMN: new_ids}
+
+    for col_name, col_type, values in zip(names[1:], types[1:], zip(*rows)):
+        new_columns[col_name] = _column_array(values, col_name, col_type)
+
+    table_data = {
+        name: np.concatenate([values, new_columns[name]])
+        for name, values in table_data.items()
+    }
+    metadata[table_name]["next_id"] = new_id + len(rows)
+
+    print(
+        f'{len(rows)} records (ID={new_id}..{new_ids[-1]}) added to table '
+        f'"{table_name}" successfully.'
+    )
+
+    return metadata, table_data, new_ids.tolist()
+
+
+def build_index(values):
+    """Map each distinct column value to the positions of rows holding it."""
+    index = {}
+    for position, value in enumerate(values.tolist()):
+        index.setdefault(value, []).append(position)
+    return index
+
+
+@handle_db_errors
+@log_time
+def select(load_column, table_meta, where_clause=None, index=None):
+    """Select records from a table, loading its columns one at a time."""
+    names = table_meta["_col_names"]
+
     if where_clause is None:
-        return table_data
-
-    results = []
-    for record in table_data:
-        match = True
-        for col, value in where_clause.items():
-            if col not in record:
-                match = False
-                break
-            record_value = record[col]
-            if isinstance(record_value, int) and isinstance(value, str):
-                try:
-                    value = int(value)
-                except ValueError:
-                    pass
-            if record_value != value:
-                match = False
-                break
-        if match:
-            results.append(record)
+        return {name: load_column(name) for name in names}
+
+    if index is not None and len(where_clause) == 1:
+        ((col, value),) = where_clause
+        col_type = table_meta["_col_types"][names.index(col)]
+        typed_value = validate_value(value, col_type)
+        positions = np.asarray(index.get(typed_value, []), dtype=np.intp)
+        return {name: load_column(name)[positions] for name in names}
+
+    predicate_data = {
+        name: load_column(name)
+        for name in (ID_COLUMN, *(col for col, _ in where_clause))
+        if name in names
+    }
+    mask = where_mask(predicate_data, table_meta, where_clause)
+
+    results = {}
+    for name in names:
+        values = predicate_data.pop(name, None)
+        if values is None:
+            values = load_column(name)
+        results[name] = values[mask]
 
     return results
 
@@ -200,16 +346,12 @@ def update(metadata, table_name, table_data, set_clause, where_clause):
         return None, None
 
     table_meta = metadata[table_name]
-    columns = table_meta["columns"]
 
     set_col = list(set_clause.keys())[0]
     set_value = set_clause[set_col]
 
-    col_type = None
-    for col in columns:
-        if col["name"] == set_col:
-            col_type = col["type"]
-            break
+    column_types = dict(zip(table_meta["_col_names"], table_meta["_col_types"]))
+    col_type = column_types.get(set_col)
 
     if col_type is None:
         print(f"Error: Column '{set_col}' does not exist.")
@@ -223,31 +365,15 @@ def update(metadata, table_name, table_data, set_clause, where_clause):
         )
         return None, None
 
-    updated_ids = []
-    for record in table_data:
-        match = True
-        for col, value in where_clause.items():
-            if col not in record:
-                match = False
-                break
-            record_value = record[col]
-            if isinstance(record_value, int) and isinstance(value, str):
-                try:
-                    value = int(value)
-                except ValueError:
-                    pass
-            if record_value != value:
-                match = False
-                break
-
-        if match:
-            record[set_col] = validated_value
-            updated_ids.append(record[ID_COLUMN])
+    mask = where_mask(table_data, table_meta, where_clause)
+    updated_ids = table_data[ID_COLUMN][mask].tolist()
 
     if not updated_ids:
         print("No records matching the condition found.")
         return table_data, []
 
+    table_data[set_col][mask] = validated_value
+
     for uid in updated_ids:
         print(f'Record with ID={uid} in table "{table_name}" updated successfully.')
 
@@ -256,36 +382,17 @@ def update(metadata, table_name, table_data, set_clause, where_clause):
 
 @handle_db_errors
 @confirm_action("delete record")
-def delete(table_name, table_data, where_clause):
+def delete(table_name, table_data, table_meta, where_clause):
     """Delete records from a table."""
-    deleted_ids = []
-    new_data = []
-
-    for record in table_data:
-        match = True
-        for col, value in where_clause.items():
-            if col not in record:
-                match = False
-                break
-            record_value = record[col]
-            if isinstance(record_value, int) and isinstance(value, str):
-                try:
-                    value = int(value)
-                except ValueError:
-                    pass
-            if record_value != value:
-                match = False
-                break
-
-        if match:
-            deleted_ids.append(record[ID_COLUMN])
-        else:
-            new_data.append(record)
+    mask = where_mask(table_data, table_meta, where_clause)
+    deleted_ids = table_data[ID_COLUMN][mask].tolist()
 
     if not deleted_ids:
         print("No records matching the condition found.")
         return table_data, []
 
+    new_data = {col: values[~mask] for col, values in table_data.items()}
+
     for did in deleted_ids:
         print(f'Record with ID={did} deleted from table "{table_name}" successfully.')
 
@@ -1,10 +1,13 @@
 """Decorators for error handling, logging, and action confirmation."""
 
 import functools
+import os
 import time
 
 import prompt
 
+from src.primitive_db.constants import LOG_TIME_ENV
+
 
 def handle_db_errors(func):
     """Decorator that handles common database errors."""
@@ -49,7 +52,14 @@ def confirm_action(action_name):
 
 
 def log_time(func):
-    """Decorator that measures and logs function execution time."""
+    """Decorator that measures and logs function execution time.
+
+    Setting the PRIMITIVE_DB_LOG_TIME environment variable to "0" disables
+    timing entirely: the function is returned unwrapped.
+    """
+    if os.environ.get(LOG_TIME_ENV) == "0":
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         start_time = time.monotonic()
@@ -80,13 +90,17 @@ def create_cacher():
     def clear_cache():
         cache.clear()
 
+    def invalidate(table_name):
+        for key in [key for key in cache if key[0] == table_name]:
+            del cache[key]
+
     def get_cache_key(table_name, where_clause):
         if where_clause is None:
             return (table_name, None)
-        where_tuple = tuple(sorted(where_clause.items()))
-        return (table_name, where_tuple)
+        return (table_name, frozenset(where_clause))
 
     cache_result.clear = clear_cache
+    cache_result.invalidate = invalidate
     cache_result.get_key = get_cache_key
 
     return cache_result
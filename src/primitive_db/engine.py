@@ -1,30 +1,41 @@
 """Engine module - handles startup, main loop, and command parsing."""
 
-import shlex
-
 import prompt
 from prettytable import PrettyTable
 
-from src.primitive_db.constants import METADATA_FILE
+from src.primitive_db.constants import (
+    DISPLAY_LIMIT,
+    ID_COLUMN,
+    INDEX_MIN_LOOKUPS,
+    METADATA_FILE,
+)
 from src.primitive_db.core import (
+    build_index,
     create_table,
     delete,
     drop_table,
     insert,
+    insert_many,
     list_tables,
+    row_count,
     select,
     table_info,
     update,
 )
 from src.primitive_db.decorators import create_cacher
 from src.primitive_db.parser import (
+    is_quoted,
     parse_delete_command,
     parse_insert_command,
     parse_select_command,
     parse_update_command,
+    split_args,
 )
 from src.primitive_db.utils import (
+    append_table_row,
+    column_loader,
     delete_table_data,
+    load_csv_rows,
     load_metadata,
     load_table_data,
     save_metadata,
@@ -32,6 +43,43 @@ from src.primitive_db.utils import (
 )
 
 select_cache = create_cacher()
+index_cache = {}
+index_lookups = {}
+
+
+def get_column_index(table_name, column, load_column):
+    """Return the cached equality index of a column, or None if not built yet.
+
+    The index is built on the INDEX_MIN_LOOKUPS-th lookup of the column, so
+    columns queried only once are filtered with a mask scan instead.
+    """
+    key = (table_name, column)
+    if key not in index_cache:
+        index_lookups[key] = index_lookups.get(key, 0) + 1
+        if index_lookups[key] < INDEX_MIN_LOOKUPS:
+            return None
+        values = load_column(column)
+        index_cache[key] = {"rows": len(values), "index": build_index(values)}
+    return index_cache[key]["index"]
+
+
+def index_appended_row(table_name, row, col_names):
+    """Add an appended row to every cached index of its table."""
+    for (cached_table, column), entry in index_cache.items():
+        if cached_table == table_name:
+            value = row[col_names.index(column)]
+            entry["index"].setdefault(value, []).append(entry["rows"])
+            entry["rows"] += 1
+
+
+def invalidate_indexes(table_name, column=None):
+    """Drop cached indexes of a table, or only the index of one column."""
+    stale_keys = [
+        key for key in index_cache
+        if key[0] == table_name and (column is None or key[1] == column)
+    ]
+    for key in stale_keys:
+        del index_cache[key]
 
 
 def print_help():
@@ -42,30 +90,34 @@ def print_help():
     print("  list_tables - show all tables")
     print("  drop_table <table_name> - delete table")
     print("  insert into <table> values (<val1>, ..) - insert record")
-    print("  select from <table> [where <col> = <val>] - read records")
-    print("  update <table> set <col>=<val> where <col>=<val> - update record")
-    print("  delete from <table> where <col> = <val> - delete record")
+    print("  copy <table> <file.csv> - insert records from CSV file")
+    print("  select from <table> [where <col>=<val> ..] [limit <n>] - read records")
+    print("  update <table> set <col>=<val> where <col>=<val> .. - update records")
+    print("  delete from <table> where <col>=<val> .. - delete records")
     print("  info <table_name> - show table information")
     print("\nGeneral:")
+    print("  reload - reload metadata from disk")
     print("  help - show help")
     print("  exit - exit program\n")
 
 
-def display_table(records, columns):
-    """Display records in a formatted table using PrettyTable."""
-    if not records:
+def display_table(records, col_names, limit=DISPLAY_LIMIT):
+    """Display up to limit records in a formatted table using PrettyTable."""
+    if records is None or not row_count(records):
         print("No records to display.")
         return
 
-    col_names = [col["name"] for col in columns]
     table = PrettyTable(col_names)
-
-    for record in records:
-        row = [record.get(col, "") for col in col_names]
-        table.add_row(row)
+    table.add_rows(
+        list(zip(*(records[col][:limit].tolist() for col in col_names)))
+    )
 
     print(table)
 
+    hidden = row_count(records) - limit
+    if hidden > 0:
+        print(f"... {hidden} more {'row' if hidden == 1 else 'rows'}.")
+
 
 def handle_create_table(args, metadata):
     """Handle create_table command."""
@@ -89,7 +141,8 @@ def handle_drop_table(args, metadata):
     if result is not None:
         save_metadata(METADATA_FILE, result)
         delete_table_data(table_name)
-        select_cache.clear()
+        invalidate_indexes(table_name)
+        select_cache.invalidate(table_name)
 
 
 def handle_info(args, metadata):
@@ -101,8 +154,8 @@ def handle_info(args, metadata):
     table_name = args[1]
     table_info(metadata, table_name)
     if table_name in metadata:
-        table_data = load_table_data(table_name)
-        print(f"Record count: {len(table_data)}")
+        load_column = column_loader(table_name, metadata[table_name]["columns"])
+        print(f"Record count: {len(load_column(ID_COLUMN))}")
 
 
 def handle_insert(args, metadata):
@@ -113,21 +166,66 @@ def handle_insert(args, metadata):
         print("Usage: insert into <table> values (<val1>, <val2>, ...)")
         return
 
-    table_data = load_table_data(table_name)
-    new_meta, new_data, _ = insert(metadata, table_name, values, table_data)
+    new_meta, row, _ = insert(metadata, table_name, values)
 
     if new_meta is not None:
+        append_table_row(table_name, row)
         save_metadata(METADATA_FILE, new_meta)
-        save_table_data(table_name, new_data)
-        select_cache.clear()
+        index_appended_row(table_name, row, new_meta[table_name]["_col_names"])
+        select_cache.invalidate(table_name)
+
+
+def handle_copy(args, metadata):
+    """Handle copy command."""
+    if len(args) < 3:
+        print("Usage: copy <table> <file.csv>")
+        return
+
+    table_name, filepath = args[1], args[2]
+    if is_quoted(filepath):
+        filepath = filepath[1:-1]
+    if table_name not in metadata:
+        print(f'Error: Table "{table_name}" does not exist.')
+        return
+
+    try:
+        rows = load_csv_rows(filepath)
+    except FileNotFoundError:
+        print(f'Error: File "{filepath}" not found.')
+        return
+    except UnicodeDecodeError:
+        print(f'Error: File "{filepath}" is not valid UTF-8 text.')
+        return
+    except OSError as e:
+        print(f'Error: Cannot read file "{filepath}": {e.strerror or e}.')
+        return
+
+    columns = metadata[table_name]["columns"]
+    header = list(metadata[table_name]["_col_names"][1:])
+    if rows and rows[0] == header:
+        rows = rows[1:]
+
+    table_data = load_table_data(table_name, columns)
+    result = insert_many(metadata, table_name, rows, table_data)
+
+    if result is not None:
+        new_meta, new_data, _ = result
+        if new_meta is not None:
+            save_metadata(METADATA_FILE, new_meta)
+            save_table_data(table_name, new_data)
+            invalidate_indexes(table_name)
+            select_cache.invalidate(table_name)
 
 
 def handle_select(args, metadata):
     """Handle select command."""
-    table_name, where_clause = parse_select_command(args[1:])
+    table_name, where_clause, limit = parse_select_command(args[1:])
 
     if table_name is None:
-        print("Usage: select from <table> [where <column> = <value>]")
+        print(
+            "Usage: select from <table> [where <col> = <val> [and ...]] "
+            "[limit <n>]"
+        )
         return
 
     if table_name not in metadata:
@@ -138,11 +236,24 @@ def handle_select(args, metadata):
     cache_key = select_cache.get_key(table_name, where_clause)
 
     def fetch_data():
-        data = load_table_data(table_name)
-        return select(data, columns, where_clause)
+        load_column = column_loader(table_name, columns)
+        index = None
+        if where_clause is not None and len(where_clause) == 1:
+            ((column, _),) = where_clause
+            names = metadata[table_name]["_col_names"]
+            if (
+                column in names
+                and metadata[table_name]["_col_types"][names.index(column)] != "bool"
+            ):
+                index = get_column_index(table_name, column, load_column)
+        return select(load_column, metadata[table_name], where_clause, index)
 
     results = select_cache(cache_key, fetch_data)
-    display_table(results, columns)
+    display_table(
+        results,
+        metadata[table_name]["_col_names"],
+        DISPLAY_LIMIT if limit is None else limit,
+    )
 
 
 def handle_update(args, metadata):
@@ -150,19 +261,23 @@ def handle_update(args, metadata):
     table_name, set_clause, where_clause = parse_update_command(args[1:])
 
     if table_name is None or set_clause is None or where_clause is None:
-        print("Usage: update <table> set <col>=<val> where <col>=<val>")
+        print(
+            "Usage: update <table> set <col> = <val> where <col> = <val> "
+            "[and ...]"
+        )
         return
 
     if table_name not in metadata:
         print(f'Error: Table "{table_name}" does not exist.')
         return
 
-    table_data = load_table_data(table_name)
+    table_data = load_table_data(table_name, metadata[table_name]["columns"])
     new_data, _ = update(metadata, table_name, table_data, set_clause, where_clause)
 
     if new_data is not None:
         save_table_data(table_name, new_data)
-        select_cache.clear()
+        invalidate_indexes(table_name, next(iter(set_clause)))
+        select_cache.invalidate(table_name)
 
 
 def handle_delete(args, metadata):
@@ -170,21 +285,22 @@ def handle_delete(args, metadata):
     table_name, where_clause = parse_delete_command(args[1:])
 
     if table_name is None or where_clause is None:
-        print("Usage: delete from <table> where <column> = <value>")
+        print("Usage: delete from <table> where <col> = <val> [and ...]")
         return
 
     if table_name not in metadata:
         print(f'Error: Table "{table_name}" does not exist.')
         return
 
-    table_data = load_table_data(table_name)
-    result = delete(table_name, table_data, where_clause)
+    table_data = load_table_data(table_name, metadata[table_name]["columns"])
+    result = delete(table_name, table_data, metadata[table_name], where_clause)
 
     if result is not None:
         new_data, _ = result
         if new_data is not None:
             save_table_data(table_name, new_data)
-            select_cache.clear()
+            invalidate_indexes(table_name)
+            select_cache.invalidate(table_name)
 
 
 COMMAND_HANDLERS = {
@@ -194,36 +310,57 @@ COMMAND_HANDLERS = {
     "drop_table": handle_drop_table,
     "info": handle_info,
     "insert": handle_insert,
+    "copy": handle_copy,
     "select": handle_select,
     "update": handle_update,
     "delete": handle_delete,
 }
 
 
+def split_command(command_str):
+    """Split a command into arguments, keeping quoted values intact."""
+    if not any(char in command_str for char in "\"'"):
+        return command_str.split()
+
+    args = split_args(command_str)
+    if args is None:
+        print("Command parsing error: No closing quotation")
+    return args
+
+
 def run():
     """Run the main database loop."""
     print("\n***Database***\n")
     print_help()
 
+    metadata = load_metadata(METADATA_FILE)
+
     while True:
-        metadata = load_metadata(METADATA_FILE)
         user_input = prompt.string(">>>Enter command: ")
 
         if not user_input or not user_input.strip():
             continue
 
-        try:
-            args = shlex.split(user_input.strip())
-        except ValueError as e:
-            print(f"Command parsing error: {e}")
+        args = split_command(user_input.strip())
+        if args is None:
             continue
 
-        command = args[0].lower()
+        command = args[0]
+        if command not in COMMAND_HANDLERS:
+            command = command.lower()
 
         if command == "exit":
             print("Goodbye!")
             break
 
+        if command == "reload":
+            metadata = load_metadata(METADATA_FILE)
+            index_cache.clear()
+            index_lookups.clear()
+            select_cache.clear()
+            print("Metadata reloaded.")
+            continue
+
         handler = COMMAND_HANDLERS.get(command)
         if handler:
             handler(args, metadata)
@@ -0,0 +1,92 @@
+"""Compiled kernels for WHERE-clause evaluation on NumPy columns."""
+
+import itertools
+
+import numpy as np
+
+from src.primitive_db.constants import JIT_MIN_ROWS
+
+try:
+    import numba as nb
+except ImportError:
+    nb = None
+
+try:
+    from src.primitive_db import _cfilter
+except ImportError:
+    _cfilter = None
+
+
+if nb is not None:
+    @nb.njit(parallel=True, nogil=True, cache=True)
+    def _and_eq_numeric(col, value, mask):
+        for i in nb.prange(mask.shape[0]):
+            mask[i] = mask[i] and col[i] == value
+
+
+_fused_kernels = {}
+
+
+def _fused_kernel(n_predicates):
+    """Return a kernel testing n numeric equality predicates in one pass."""
+    kernel = _fused_kernels.get(n_predicates)
+    if kernel is None:
+        params = ", ".join(f"col{k}, val{k}" for k in range(n_predicates))
+        test = " and ".join(f"col{k}[i] == val{k}" for k in range(n_predicates))
+        source = (
+            f"def kernel(mask, {params}):\n"
+            f"    for i in nb.prange(mask.shape[0]):\n"
+            f"        mask[i] = mask[i] and {test}\n"
+        )
+        namespace = {"nb": nb}
+        exec(source, namespace)
+        kernel = nb.njit(parallel=True, nogil=True)(namespace["kernel"])
+        _fused_kernels[n_predicates] = kernel
+    return kernel
+
+
+def _use_jit(mask):
+    """Check whether numba kernels are available and worth running on mask.
+
+    Below JIT_MIN_ROWS rows NumPy finishes faster than numba can load or
+    compile a kernel.
+    """
+    return nb is not None and mask.shape[0] >= JIT_MIN_ROWS
+
+
+def and_eq(col, value, mask):
+    """AND an equality test of the column against value into mask in place."""
+    if _use_jit(mask) and col.dtype.kind in "ib":
+        _and_eq_numeric(col, col.dtype.type(value), mask)
+    elif _cfilter is not None and col.dtype == object:
+        _cfilter.and_eq_object(col, value, mask.view(np.uint8))
+    else:
+        np.logical_and(mask, col == value, out=mask)
+
+
+def and_eq_many(predicates, mask):
+    """AND equality tests of (column, value) pairs into mask, in given order."""
+    rows = None
+
+    if _use_jit(mask):
+        numeric = [
+            (col, col.dtype.type(value))
+            for col, value in predicates
+            if col.dtype.kind in "ib"
+        ]
+        if len(numeric) > 1:
+            _fused_kernel(len(numeric))(mask, *itertools.chain(*numeric))
+            predicates = [(col, value) for col, value in predicates
+                          if col.dtype.kind not in "ib"]
+            rows = np.flatnonzero(mask)
+
+    for col, value in predicates:
+        if rows is None:
+            and_eq(col, value, mask)
+        elif not rows.size:
+            break
+        else:
+            row_mask = np.ones(rows.size, dtype=bool)
+            and_eq(col[rows], value, row_mask)
+            mask[rows] = row_mask
+        rows = np.flatnonzero(mask)
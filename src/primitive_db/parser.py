@@ -2,10 +2,24 @@
 
 import re
 
+_CONDITION_RE = re.compile(r'(\w+)\s*=\s*(.+)')
+_INSERT_RE = re.compile(r'into\s+(\w+)\s+values\s*\((.+)\)', re.IGNORECASE)
+_SELECT_WHERE_RE = re.compile(r'from\s+(\w+)\s+where\s+(.+)', re.IGNORECASE)
+_SELECT_RE = re.compile(r'from\s+(\w+)', re.IGNORECASE)
+_LIMIT_RE = re.compile(r'(.*?)\s+limit\s+(\d+)\s*$', re.IGNORECASE)
+_UPDATE_RE = re.compile(
+    r'(\w+)\s+set\s+((?:"[^"]*"|\'[^\']*\'|[^"\'])+?)\s+where\s+(.+)',
+    re.IGNORECASE,
+)
+_DELETE_RE = re.compile(r'from\s+(\w+)\s+where\s+(.+)', re.IGNORECASE)
+_WHERE_PART_RE = re.compile(r'"[^"]*"|\'[^\']*\'|\s+and\s+', re.IGNORECASE)
+_ARG_RE = re.compile(r'(?:"[^"]*"|\'[^\']*\'|[^\s"\'])+|["\']')
+_VALUE_TOKEN_RE = re.compile(r'((?:"[^"]*"?|\'[^\']*\'?|[^,"\'])*)(,?)')
+
 
 def parse_condition(condition_str):
     """Parse a WHERE or SET condition string into a dictionary."""
-    match = re.match(r'(\w+)\s*=\s*(.+)', condition_str.strip())
+    match = _CONDITION_RE.match(condition_str.strip())
     if not match:
         return None
 
@@ -16,12 +30,43 @@ def parse_condition(condition_str):
     return {column: value}
 
 
+def parse_where(where_str):
+    """Parse a WHERE clause of AND-joined conditions into (column, value) pairs.
+
+    A column may appear in several conditions; each one is kept, so
+    conflicting values for the same column match no rows.
+    """
+    parts = []
+    start = 0
+
+    for match in _WHERE_PART_RE.finditer(where_str):
+        if match.group()[0] in ('"', "'"):
+            continue
+        parts.append(where_str[start:match.start()])
+        start = match.end()
+    parts.append(where_str[start:])
+
+    where_clause = []
+    for part in parts:
+        condition = parse_condition(part)
+        if condition is None:
+            return None
+        where_clause.extend(condition.items())
+
+    return where_clause
+
+
+def is_quoted(value_str):
+    """Check whether a string is wrapped in matching single or double quotes."""
+    return len(value_str) >= 2 and value_str[0] in "\"'" and \
+        value_str[-1] == value_str[0]
+
+
 def parse_value(value_str):
     """Parse a string value into appropriate Python type."""
     value_str = value_str.strip()
 
-    if (value_str.startswith('"') and value_str.endswith('"')) or \
-       (value_str.startswith("'") and value_str.endswith("'")):
+    if is_quoted(value_str):
         return value_str[1:-1]
 
     if value_str.lower() == "true":
@@ -40,40 +85,31 @@ def parse_value(value_str):
 def parse_values_list(values_str):
     """Parse a comma-separated list of values from INSERT command."""
     values = []
-    current = ""
-    in_quotes = False
-    quote_char = None
-
-    for char in values_str:
-        if char in ('"', "'") and not in_quotes:
-            in_quotes = True
-            quote_char = char
-            current += char
-        elif char == quote_char and in_quotes:
-            in_quotes = False
-            quote_char = None
-            current += char
-        elif char == "," and not in_quotes:
-            values.append(parse_value(current.strip()))
-            current = ""
-        else:
-            current += char
-
-    if current.strip():
-        values.append(parse_value(current.strip()))
+
+    for token, separator in _VALUE_TOKEN_RE.findall(values_str):
+        token = token.strip()
+        if separator or token:
+            values.append(parse_value(token))
 
     return values
 
 
+def split_args(command_str):
+    """Split a command on whitespace outside quotes, keeping the quotes.
+
+    Returns None when a quote is left unterminated.
+    """
+    args = _ARG_RE.findall(command_str)
+    if any(arg in ('"', "'") for arg in args):
+        return None
+    return args
+
+
 def parse_insert_command(args):
     """Parse INSERT command: into <table> values (<val1>, <val2>, ...)"""
     cmd_str = " ".join(args)
 
-    match = re.match(
-        r'into\s+(\w+)\s+values\s*\((.+)\)',
-        cmd_str,
-        re.IGNORECASE
-    )
+    match = _INSERT_RE.match(cmd_str)
 
     if not match:
         return None, None
@@ -86,37 +122,39 @@ def parse_insert_command(args):
 
 
 def parse_select_command(args):
-    """Parse SELECT command: from <table> [where <col> = <val>]"""
+    """Parse SELECT: from <table> [where <col> = <val> [and ...]] [limit <n>]"""
     cmd_str = " ".join(args)
 
-    match = re.match(
-        r'from\s+(\w+)\s+where\s+(.+)',
-        cmd_str,
-        re.IGNORECASE
-    )
+    limit = None
+    match = _LIMIT_RE.match(cmd_str)
+    if match:
+        cmd_str = match.group(1)
+        limit = int(match.group(2))
+        if limit == 0:
+            return None, None, None
+
+    match = _SELECT_WHERE_RE.match(cmd_str)
 
     if match:
         table_name = match.group(1)
         where_str = match.group(2)
-        where_clause = parse_condition(where_str)
-        return table_name, where_clause
+        where_clause = parse_where(where_str)
+        if where_clause is None:
+            return None, None, None
+        return table_name, where_clause, limit
 
-    match = re.match(r'from\s+(\w+)', cmd_str, re.IGNORECASE)
+    match = _SELECT_RE.match(cmd_str)
     if match:
-        return match.group(1), None
+        return match.group(1), None, limit
 
-    return None, None
+    return None, None, None
 
 
 def parse_update_command(args):
-    """Parse UPDATE command: <table> set <col>=<val> where <col>=<val>"""
+    """Parse UPDATE: <table> set <col>=<val> where <col>=<val> [and ...]"""
     cmd_str = " ".join(args)
 
-    match = re.match(
-        r'(\w+)\s+set\s+(.+?)\s+where\s+(.+)',
-        cmd_str,
-        re.IGNORECASE
-    )
+    match = _UPDATE_RE.match(cmd_str)
 
     if not match:
         return None, None, None
@@ -126,26 +164,22 @@ def parse_update_command(args):
     where_str = match.group(3)
 
     set_clause = parse_condition(set_str)
-    where_clause = parse_condition(where_str)
+    where_clause = parse_where(where_str)
 
     return table_name, set_clause, where_clause
 
 
 def parse_delete_command(args):
-    """Parse DELETE command: from <table> where <col> = <val>"""
+    """Parse DELETE: from <table> where <col> = <val> [and ...]"""
     cmd_str = " ".join(args)
 
-    match = re.match(
-        r'from\s+(\w+)\s+where\s+(.+)',
-        cmd_str,
-        re.IGNORECASE
-    )
+    match = _DELETE_RE.match(cmd_str)
 
     if not match:
         return None, None
 
     table_name = match.group(1)
     where_str = match.group(2)
-    where_clause = parse_condition(where_str)
+    where_clause = parse_where(where_str)
 
     return table_name, where_clause
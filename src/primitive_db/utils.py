@@ -1,48 +1,224 @@
 """Utility functions for file operations."""
 
+import csv
 import json
 import os
 
-from src.primitive_db.constants import DATA_DIR
+import numpy as np
+
+from src.primitive_db.constants import DATA_DIR, LOG_COMPACT_ROWS, NUMPY_DTYPES
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(data, indent=False):
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+else:
+    _json_loads = json.loads
+
+    def _json_dumps(data, indent=False):
+        text = json.dumps(data, indent=2 if indent else None, ensure_ascii=False)
+        return text.encode("utf-8")
+
+
+def cache_column_info(table_meta):
+    """Cache column name and type tuples on a table metadata entry."""
+    columns = table_meta["columns"]
+    table_meta["_col_names"] = tuple(col["name"] for col in columns)
+    table_meta["_col_types"] = tuple(col["type"] for col in columns)
+    return table_meta
 
 
 def load_metadata(filepath):
     """Load metadata from JSON file, return empty dict if not found."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(filepath, "rb") as f:
+            metadata = _json_loads(f.read())
     except FileNotFoundError:
         return {}
 
+    for table_meta in metadata.values():
+        cache_column_info(table_meta)
+
+    return metadata
+
 
 def save_metadata(filepath, data):
-    """Save metadata to JSON file."""
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    """Save metadata to JSON file, without the cached column info."""
+    stored = {
+        table_name: {
+            key: value for key, value in table_meta.items()
+            if not key.startswith("_")
+        }
+        for table_name, table_meta in data.items()
+    }
+    with open(filepath, "wb") as f:
+        f.write(_json_dumps(stored, indent=True))
+
 
+def rows_to_columns(rows, columns):
+    """Convert positional row tuples into a dict of NumPy column arrays."""
+    values_by_column = list(zip(*rows)) if rows else [()] * len(columns)
+    return {
+        col["name"]: np.asarray(values, dtype=NUMPY_DTYPES[col["type"]])
+        for col, values in zip(columns, values_by_column)
+    }
 
-def load_table_data(table_name):
-    """Load table data from JSON file, return empty list if not found."""
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
+
+def records_to_columns(records, columns):
+    """Convert a list of record dicts into a dict of NumPy column arrays."""
+    names = [col["name"] for col in columns]
+    rows = [tuple(record[name] for name in names) for record in records]
+    return rows_to_columns(rows, columns)
+
+
+def _table_path(table_name, extension):
+    """Return the path of a table data file with the given extension."""
+    return os.path.join(DATA_DIR, f"{table_name}.{extension}")
+
+
+def _encode_strings(values):
+    """Encode a str column as UTF-8 bytes plus an array of row offsets."""
+    encoded = [value.encode("utf-8") for value in values.tolist()]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    data = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+    return data, offsets
+
+
+def _decode_strings(data, offsets):
+    """Decode a str column stored by _encode_strings."""
+    buffer = data.tobytes()
+    bounds = offsets.tolist()
+    return np.array(
+        [buffer[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])],
+        dtype=object,
+    )
+
+
+def _load_appended_rows(table_name):
+    """Load rows appended to the table log since the last snapshot."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(_table_path(table_name, "jsonl"), "rb") as f:
+            return [_json_loads(line) for line in f if line.strip()]
     except FileNotFoundError:
         return []
 
 
+def _migrate_json_table(table_name, columns):
+    """Convert a legacy JSON table file, plus any appended rows, to NPZ."""
+    legacy_filepath = _table_path(table_name, "json")
+    with open(legacy_filepath, "rb") as f:
+        table_data = records_to_columns(_json_loads(f.read()), columns)
+
+    appended = _load_appended_rows(table_name)
+    if appended:
+        new_data = rows_to_columns(appended, columns)
+        table_data = {
+            name: np.concatenate([values, new_data[name]])
+            for name, values in table_data.items()
+        }
+
+    save_table_data(table_name, table_data)
+    os.remove(legacy_filepath)
+
+
+def column_loader(table_name, columns):
+    """Return a function that loads one table column at a time.
+
+    The append log is parsed once up front, while snapshot columns are read
+    from the NPZ file only when requested, so callers that process columns
+    one by one keep peak memory close to a single column. A log of at least
+    LOG_COMPACT_ROWS rows is folded into the snapshot first.
+    """
+    if os.path.exists(_table_path(table_name, "json")):
+        _migrate_json_table(table_name, columns)
+
+    filepath = _table_path(table_name, "npz")
+    positions = {col["name"]: i for i, col in enumerate(columns)}
+    dtypes = {col["name"]: NUMPY_DTYPES[col["type"]] for col in columns}
+    appended = list(zip(*_load_appended_rows(table_name)))
+
+    def load_column(name):
+        position = positions[name]
+        dtype = dtypes[name]
+
+        if os.path.exists(filepath):
+            with np.load(filepath) as archive:
+                if dtype == "object":
+                    values = _decode_strings(
+                        archive[f"{name}.data"], archive[f"{name}.offsets"]
+                    )
+                else:
+                    values = archive[f"{name}.values"].astype(dtype, copy=False)
+        else:
+            values = np.asarray([], dtype=dtype)
+
+        if appended:
+            new_values = np.asarray(appended[position], dtype=dtype)
+            values = np.concatenate([values, new_values])
+
+        return values
+
+    if appended and len(appended[0]) >= LOG_COMPACT_ROWS:
+        save_table_data(
+            table_name, {col["name"]: load_column(col["name"]) for col in columns}
+        )
+        appended.clear()
+
+    return load_column
+
+
+def load_table_data(table_name, columns):
+    """Load table data as NumPy column arrays, including appended rows."""
+    load_column = column_loader(table_name, columns)
+    return {col["name"]: load_column(col["name"]) for col in columns}
+
+
 def save_table_data(table_name, data):
-    """Save table data to JSON file."""
+    """Save NumPy column arrays to NPZ file and truncate the append log."""
     if not os.path.exists(DATA_DIR):
         os.makedirs(DATA_DIR)
 
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    arrays = {}
+    for name, values in data.items():
+        if values.dtype == object:
+            arrays[f"{name}.data"], arrays[f"{name}.offsets"] = (
+                _encode_strings(values)
+            )
+        else:
+            arrays[f"{name}.values"] = values
+    np.savez(_table_path(table_name, "npz"), **arrays)
+
+    log_filepath = _table_path(table_name, "jsonl")
+    if os.path.exists(log_filepath):
+        os.remove(log_filepath)
+
+
+def append_table_row(table_name, row):
+    """Append a single row to the table log without rewriting the table."""
+    if not os.path.exists(DATA_DIR):
+        os.makedirs(DATA_DIR)
+
+    with open(_table_path(table_name, "jsonl"), "ab") as f:
+        f.write(_json_dumps(row) + b"\n")
 
 
 def delete_table_data(table_name):
-    """Delete table data file."""
-    filepath = os.path.join(DATA_DIR, f"{table_name}.json")
-    if os.path.exists(filepath):
-        os.remove(filepath)
+    """Delete table data files."""
+    for extension in ("npz", "jsonl", "json"):
+        filepath = _table_path(table_name, extension)
+        if os.path.exists(filepath):
+            os.remove(filepath)
+
+
+def load_csv_rows(filepath):
+    """Load non-empty rows of values from a CSV file."""
+    with open(filepath, "r", encoding="utf-8", newline="") as f:
+        return [row for row in csv.reader(f, skipinitialspace=True) if row]
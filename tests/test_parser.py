@@ -0,0 +1,27 @@
+"""Tests for the command parser."""
+
+import time
+import unittest
+
+from src.primitive_db.parser import parse_update_command
+
+
+class ParseUpdateCommandTest(unittest.TestCase):
+    def test_quoted_set_value_containing_where(self):
+        table, set_clause, where_clause = parse_update_command(
+            ["users", "set", 'note="a where b"', "where", "ID", "=", "1"]
+        )
+        self.assertEqual(table, "users")
+        self.assertEqual(set_clause, {"note": "a where b"})
+        self.assertEqual(where_clause, [("ID", 1)])
+
+    def test_long_quoted_set_without_where_fails_fast(self):
+        for token in ('"ok"', '""'):
+            args = ["users", "set", "note", "="] + [token] * 40
+            start = time.perf_counter()
+            self.assertEqual(parse_update_command(args), (None, None, None))
+            self.assertLess(time.perf_counter() - start, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()